@@ -5,17 +5,85 @@ Point d'entr
 Permet de faire des prdictions via des requtes HTTP.
 """
 
-from flask import Flask, request, render_template, jsonify
+from flask import Flask, Response, request, render_template, jsonify, stream_with_context
+from flask.json.provider import JSONProvider
+import orjson
 import pandas as pd
+import os
 import sys
+import json
+import hashlib
+import threading
+import functools
+from cachetools import TTLCache
 
-from src.pipeline.prediction_pipeline import CustomData, PredictPipeline
+# gevent (optionnel) : utilis uniquement sous gunicorn avec des workers gevent
+try:
+    import gevent
+    from gevent import monkey
+    GEVENT_AVAILABLE = True
+except ImportError:
+    GEVENT_AVAILABLE = False
+
+from src.components.data_transformation import DataTransformationConfig
+from src.pipeline.prediction_pipeline import PredictPipeline, PredictionBatcher
 from src.exception import CustomException
 from src.logger import logging
 from src.utils.common import read_yaml
 
+class OrjsonProvider(JSONProvider):
+    """
+    Fournisseur JSON de Flask bas sur orjson
+
+    Plus rapide que le module json standard et capable de srialiser
+    directement les tableaux et scalaires NumPy (prdictions du modle).
+    """
+
+    option = orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.option),
+            mimetype="application/json"
+        )
+
+
 # Cration de l'application Flask
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+
+def _feature_schema():
+    """
+    Construit le schma des features attendues en entre du modle
+
+    Le schma est driv des colonnes sur lesquelles le preprocessor est
+    entran (DataTransformationConfig) : l'API ne peut pas diverger du modle.
+
+    Returns:
+        dict: {nom_colonne: type pandas}, colonnes numriques puis catgorielles
+    """
+    transformation_config = DataTransformationConfig()
+    schema = {column: "float64" for column in transformation_config.numerical_columns}
+    schema.update({column: "object" for column in transformation_config.categorical_columns})
+    return schema
+
+
+# Features attendues en entre du modle (nom : type pandas)
+FEATURE_SCHEMA = _feature_schema()
+
+# Observation fictive utilise pour prchauffer le pipeline au dmarrage
+DEFAULT_WARMUP_ROW = {
+    column: 0.0 if dtype == "float64" else "warmup"
+    for column, dtype in FEATURE_SCHEMA.items()
+}
 
 # Chargement de la configuration
 try:
@@ -23,11 +91,229 @@ try:
     API_HOST = config.get("api", {}).get("host", "0.0.0.0")
     API_PORT = config.get("api", {}).get("port", 5000)
     API_DEBUG = config.get("api", {}).get("debug", False)
+    CACHE_MAXSIZE = config.get("api", {}).get("cache", {}).get("maxsize", 10_000)
+    CACHE_TTL = config.get("api", {}).get("cache", {}).get("ttl", 300)
+    BATCH_MAX_SIZE = config.get("api", {}).get("batching", {}).get("max_batch_size", 64)
+    BATCH_MAX_WAIT_MS = config.get("api", {}).get("batching", {}).get("max_wait_ms", 5)
+    BATCH_TIMEOUT = config.get("api", {}).get("batching", {}).get("timeout", 30)
+    WARMUP_ENABLED = config.get("api", {}).get("warmup", {}).get("enabled", True)
+    WARMUP_ROW = config.get("api", {}).get("warmup", {}).get("row", DEFAULT_WARMUP_ROW)
+    WARMUP_QUERIES_PATH = config.get("api", {}).get("warmup", {}).get("queries_path")
 except Exception as e:
     logging.warning("Impossible de charger la config, utilisation des valeurs par dfaut")
     API_HOST = "0.0.0.0"
     API_PORT = 5000
     API_DEBUG = False
+    CACHE_MAXSIZE = 10_000
+    CACHE_TTL = 300
+    BATCH_MAX_SIZE = 64
+    BATCH_MAX_WAIT_MS = 5
+    BATCH_TIMEOUT = 30
+    WARMUP_ENABLED = True
+    WARMUP_ROW = DEFAULT_WARMUP_ROW
+    WARMUP_QUERIES_PATH = None
+
+# Colonnes attendues en entre du modle, dans l'ordre du schma
+FEATURE_COLUMNS = list(FEATURE_SCHEMA)
+_FEATURE_SET = frozenset(FEATURE_COLUMNS)
+
+# Pipeline de prdiction partag entre les requtes (instanci une seule fois)
+_PIPELINE = None
+_PIPELINE_LOCK = threading.Lock()
+
+
+def get_pipeline():
+    """
+    Retourne l'instance unique du pipeline de prdiction
+
+    Le pipeline est cr au premier appel puis rutilis par toutes les requtes,
+    ce qui vite de le reconstruire  chaque prdiction.
+
+    Returns:
+        PredictPipeline: Pipeline de prdiction partag
+    """
+    global _PIPELINE
+
+    if _PIPELINE is None:
+        with _PIPELINE_LOCK:
+            if _PIPELINE is None:
+                _PIPELINE = PredictPipeline()
+
+    return _PIPELINE
+
+
+# Cache des prdictions (LRU born avec expiration)
+# Le TTL garantit qu'un modle recharg finit par remplacer les anciennes prdictions
+_PREDICTION_CACHE = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL)
+_CACHE_LOCK = threading.RLock()
+_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+def _cache_key(data):
+    """
+    Calcule la cl de cache d'une observation
+
+    Args:
+        data: Dictionnaire des features reues en JSON
+
+    Returns:
+        bytes: Empreinte canonique des features (indpendante de l'ordre des cls)
+    """
+    payload = json.dumps(data, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(payload).digest()
+
+
+def _feature_errors(row):
+    """
+    Vrifie qu'une observation contient exactement les features attendues
+
+    Les valeurs numriques doivent tre des nombres JSON (ou null, imput par
+    le preprocessor) : une seule observation invalide ferait sinon chouer
+    tout le lot dans lequel elle est prdite.
+
+    Args:
+        row: Observation reue en JSON
+
+    Returns:
+        str ou None: Description de l'erreur, None si l'observation est valide
+    """
+    if not isinstance(row, dict):
+        return "un objet JSON est attendu"
+
+    missing = [column for column in FEATURE_COLUMNS if column not in row]
+    unknown = [key for key in row if key not in _FEATURE_SET]
+    if missing or unknown:
+        return f"features manquantes : {missing}, features inconnues : {unknown}"
+
+    not_numeric = [
+        column for column, dtype in FEATURE_SCHEMA.items()
+        if dtype == "float64"
+        and row[column] is not None
+        and (isinstance(row[column], bool) or not isinstance(row[column], (int, float)))
+    ]
+    if not_numeric:
+        return f"valeurs numriques attendues pour : {not_numeric}"
+
+    return None
+
+
+def _to_dataframe(rows):
+    """
+    Construit un DataFrame typ selon le schma des features
+
+    Les colonnes et leurs types sont connus  l'avance : pandas n'a pas  les
+    dduire des dictionnaires reus.
+
+    Args:
+        rows: Liste de dictionnaires de features
+
+    Returns:
+        DataFrame: Donnes prtes pour le pipeline de prdiction
+    """
+    df = pd.DataFrame.from_records(rows, columns=FEATURE_COLUMNS)
+    return df.astype(FEATURE_SCHEMA, copy=False)
+
+
+def _run_blocking(func, *args):
+    """
+    Excute une fonction bloquante (calcul sklearn/BLAS) sans bloquer les autres requtes
+
+    Sous gunicorn avec des workers gevent, la fonction est excute dans le pool
+    de threads natifs du hub gevent du processus courant (cr  la demande,
+    donc aprs le fork) : seule la greenlet appelante attend. Sans gevent
+    (serveur de dveloppement), l'appel est direct : chaque requte a dj son
+    propre thread.
+
+    Args:
+        func: Fonction bloquante  excuter
+        *args: Arguments de la fonction
+
+    Returns:
+        Rsultat de la fonction
+    """
+    if GEVENT_AVAILABLE and monkey.is_module_patched("threading"):
+        return gevent.get_hub().threadpool.apply(func, args)
+    return func(*args)
+
+
+def _predict_rows(rows):
+    """
+    Prdit un lot d'observations en un seul appel au pipeline
+
+    Args:
+        rows: Liste de dictionnaires de features
+
+    Returns:
+        array: Une prdiction par observation
+    """
+    df = _to_dataframe(rows)
+    return get_pipeline().predict(df)
+
+
+# Regroupement des requtes /predict concurrentes en un seul appel au modle
+# (la prdiction d'un lot est excute hors de la boucle gevent)
+_BATCHER = PredictionBatcher(
+    functools.partial(_run_blocking, _predict_rows),
+    max_batch_size=BATCH_MAX_SIZE,
+    max_wait_ms=BATCH_MAX_WAIT_MS
+)
+
+
+def _ndjson_lines(predictions):
+    """
+    Gnre les prdictions au format NDJSON (un objet JSON par ligne)
+
+    Args:
+        predictions: Tableau des prdictions
+
+    Yields:
+        bytes: Ligne JSON {"index": ..., "prediction": ...} termine par un saut de ligne
+    """
+    for index, prediction in enumerate(predictions):
+        yield orjson.dumps({"index": index, "prediction": float(prediction)}) + b"\n"
+
+
+def warmup():
+    """
+    Prchauffe le pipeline de prdiction et le cache des prdictions
+
+    Une prdiction fictive force le chargement du modle et l'initialisation
+    des bibliothques de calcul avant la premire vraie requte. Les requtes
+    frquentes listes dans le fichier de prchauffage (une observation JSON
+    par ligne, optionnel) sont ensuite pr-calcules dans le cache.
+    """
+    try:
+        _predict_rows([WARMUP_ROW])
+        logging.info("Pipeline de prdiction prchauff")
+    except Exception as e:
+        logging.warning(f"Prchauffage du pipeline impossible : {str(e)}")
+        return
+
+    if not WARMUP_QUERIES_PATH or not os.path.exists(WARMUP_QUERIES_PATH):
+        return
+
+    try:
+        with open(WARMUP_QUERIES_PATH, "r", encoding="utf-8") as queries_file:
+            queries = [json.loads(line) for line in queries_file if line.strip()]
+
+        if queries:
+            results = _predict_rows(queries)
+            with _CACHE_LOCK:
+                for query, result in zip(queries, results):
+                    _PREDICTION_CACHE[_cache_key(query)] = float(result)
+
+        logging.info(f"Cache des prdictions prchauff : {len(queries)} requtes")
+
+    except Exception as e:
+        logging.warning(f"Prchauffage du cache impossible : {str(e)}")
+
+
+# Initialisation du pipeline au chargement du module
+# Avec gunicorn --preload, il est cr (et prchauff) une seule fois dans le
+# processus matre puis partag par tous les workers aprs le fork
+get_pipeline()
+if WARMUP_ENABLED:
+    warmup()
 
 
 @app.route('/')
@@ -60,7 +346,12 @@ def health():
     return jsonify({
         "status": "healthy",
         "message": "L'API fonctionne correctement",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "cache": {
+            "hits": _CACHE_STATS["hits"],
+            "misses": _CACHE_STATS["misses"],
+            "size": len(_PREDICTION_CACHE)
+        }
     })
 
 
@@ -75,7 +366,9 @@ def predict_api():
     {
         "feature1": 10.5,
         "feature2": 20.3,
-        "feature3": "category_A"
+        "feature3": 1.2,
+        "category1": "A",
+        "category2": "X"
     }
 
     Returns:
@@ -93,22 +386,40 @@ def predict_api():
 
         logging.info(f"Requte de prdiction reue : {data}")
 
-        # Cration d'un DataFrame  partir du JSON
-        # Adapter selon vos features
-        df = pd.DataFrame([data])
+        # Validation des features avant le cache et le regroupement en lot
+        error = _feature_errors(data)
+        if error:
+            return jsonify({
+                "error": "Features invalides",
+                "message": error,
+                "expected_features": FEATURE_COLUMNS
+            }), 400
 
-        # Pipeline de prdiction
-        predict_pipeline = PredictPipeline()
-        results = predict_pipeline.predict(df)
+        # Recherche dans le cache des prdictions
+        cache_key = _cache_key(data)
+        with _CACHE_LOCK:
+            prediction = _PREDICTION_CACHE.get(cache_key)
+            if prediction is None:
+                _CACHE_STATS["misses"] += 1
+            else:
+                _CACHE_STATS["hits"] += 1
+
+        if prediction is None:
+            # Prdiction regroupe avec les autres requtes concurrentes
+            result = _BATCHER.submit(data).result(timeout=BATCH_TIMEOUT)
+            prediction = float(result)
+
+            with _CACHE_LOCK:
+                _PREDICTION_CACHE[cache_key] = prediction
 
         # Formatage de la rponse
         response = {
-            "prediction": float(results[0]),
+            "prediction": prediction,
             "status": "success",
             "input_data": data
         }
 
-        logging.info(f"Prdiction russie : {results[0]}")
+        logging.info(f"Prdiction russie : {prediction}")
 
         return jsonify(response), 200
 
@@ -125,44 +436,42 @@ def predict_form():
     """
     Endpoint avec formulaire HTML pour faire des prdictions
 
-    GET : Affiche le formulaire
+    GET : Affiche le formulaire (un champ par feature du schma)
     POST : Traite les donnes du formulaire et retourne la prdiction
 
     Returns:
         HTML: Formulaire ou rsultat de prdiction
     """
     if request.method == 'GET':
-        # Affichage du formulaire
-        return """
+        # Affichage du formulaire : un champ par colonne attendue par le preprocessor
+        fields = "".join(
+            f"""
+            <label>{column} ({"numrique" if dtype == "float64" else "catgoriel"}):</label><br>
+            <input {'type="number" step="any"' if dtype == "float64" else 'type="text"'} name="{column}" required><br><br>
+            """
+            for column, dtype in FEATURE_SCHEMA.items()
+        )
+        return f"""
         <h1>Formulaire de Prdiction</h1>
         <form method="POST">
-            <label>Feature 1 (numrique):</label><br>
-            <input type="number" step="any" name="feature1" required><br><br>
-
-            <label>Feature 2 (numrique):</label><br>
-            <input type="number" step="any" name="feature2" required><br><br>
-
-            <label>Feature 3 (catgoriel):</label><br>
-            <input type="text" name="feature3" required><br><br>
-
+            {fields}
             <input type="submit" value="Prdire">
         </form>
         """
 
     try:
-        # Rcupration des donnes du formulaire
-        data = CustomData(
-            feature1=float(request.form.get('feature1')),
-            feature2=float(request.form.get('feature2')),
-            feature3=request.form.get('feature3')
-        )
+        # Rcupration des donnes du formulaire (converties selon le schma)
+        row = {
+            column: float(request.form[column]) if dtype == "float64" else request.form[column]
+            for column, dtype in FEATURE_SCHEMA.items()
+        }
 
-        # Conversion en DataFrame
-        pred_df = data.get_data_as_dataframe()
+        # Conversion en DataFrame typ
+        pred_df = _to_dataframe([row])
 
         # Pipeline de prdiction
-        predict_pipeline = PredictPipeline()
-        results = predict_pipeline.predict(pred_df)
+        predict_pipeline = get_pipeline()
+        results = _run_blocking(predict_pipeline.predict, pred_df)
 
         logging.info(f"Prdiction via formulaire : {results[0]}")
 
@@ -193,13 +502,17 @@ def batch_predict():
     Exemple de requte :
     {
         "data": [
-            {"feature1": 10.5, "feature2": 20.3, "feature3": "A"},
-            {"feature1": 15.2, "feature2": 18.7, "feature3": "B"}
+            {"feature1": 10.5, "feature2": 20.3, "feature3": 1.2, "category1": "A", "category2": "X"},
+            {"feature1": 15.2, "feature2": 18.7, "feature3": 0.4, "category1": "B", "category2": "Y"}
         ]
     }
 
+    Avec le paramtre ?stream=1, les prdictions sont renvoyes en flux NDJSON
+    (une ligne par observation) : le client peut les lire au fur et  mesure,
+    sans que la rponse complte soit construite en mmoire.
+
     Returns:
-        JSON: Liste des prdictions
+        JSON: Liste des prdictions (ou flux NDJSON si stream=1)
     """
     try:
         # Rcupration des donnes JSON
@@ -214,15 +527,39 @@ def batch_predict():
 
         logging.info(f"Requte de prdiction batch : {len(data_list)} observations")
 
-        # Cration d'un DataFrame
-        df = pd.DataFrame(data_list)
-
-        # Pipeline de prdiction
-        predict_pipeline = PredictPipeline()
-        results = predict_pipeline.predict(df)
+        # Validation des features de chaque observation (la premire erreur est renvoye)
+        if not isinstance(data_list, list):
+            return jsonify({
+                "error": "Features invalides",
+                "message": "\"data\" doit tre une liste d'observations"
+            }), 400
 
-        # Formatage de la rponse
-        predictions = [float(pred) for pred in results]
+        for index, row in enumerate(data_list):
+            error = _feature_errors(row)
+            if error:
+                return jsonify({
+                    "error": "Features invalides",
+                    "message": f"Observation {index} : {error}",
+                    "expected_features": FEATURE_COLUMNS
+                }), 400
+
+        # Cration d'un DataFrame typ selon le schma des features
+        df = _to_dataframe(data_list)
+
+        # Pipeline de prdiction (excut hors de la boucle gevent)
+        predict_pipeline = get_pipeline()
+        results = _run_blocking(predict_pipeline.predict, df)
+
+        # Rponse en flux NDJSON si demande
+        if request.args.get("stream") == "1":
+            logging.info(f"Prdictions batch envoyes en flux : {len(results)} rsultats")
+            return Response(
+                stream_with_context(_ndjson_lines(results)),
+                mimetype="application/x-ndjson"
+            )
+
+        # Formatage de la rponse (tableau NumPy srialis directement par orjson)
+        predictions = results
         response = {
             "predictions": predictions,
             "count": len(predictions),
@@ -242,8 +579,11 @@ def batch_predict():
 
 
 # Point d'entre de l'application
+# Serveur de dveloppement uniquement. En production, utiliser gunicorn :
+#   gunicorn -c gunicorn.conf.py app:app
+# (quivalent  : gunicorn -k gevent -w $(nproc) --preload -b $HOST:$PORT app:app)
 if __name__ == "__main__":
-    logging.info("Dmarrage de l'application Flask")
+    logging.info("Dmarrage de l'application Flask (serveur de dveloppement)")
     logging.info(f"Host: {API_HOST}, Port: {API_PORT}, Debug: {API_DEBUG}")
 
     app.run(
@@ -0,0 +1,40 @@
+"""
+Configuration du serveur gunicorn pour l'API de prdiction
+
+Remplace le serveur de dveloppement de Flask en production :
+- Plusieurs workers (un par CPU) pour servir les requtes en parallle
+- Workers gevent pour grer de nombreuses connexions simultanes
+- Prchargement de l'application : le pipeline de prdiction est cr une seule
+  fois dans le processus matre puis partag par les workers aprs le fork
+
+Lancement :
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+# Patch gevent avant tout autre import : avec preload_app, l'application est
+# importe dans le processus matre avant le fork, et ses verrous, files et
+# threads doivent dj tre ceux de gevent pour ne pas bloquer le hub des workers
+from gevent import monkey
+monkey.patch_all()
+
+import os
+import multiprocessing
+
+# Adresse d'coute (surchargeable via les variables d'environnement HOST et PORT)
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+
+# Nombre de workers (par dfaut un par CPU)
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# Type de worker : gevent (I/O non bloquantes)
+worker_class = "gevent"
+
+# Chargement de l'application avant le fork des workers
+preload_app = True
+
+# Dlai maximal de traitement d'une requte (secondes)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+
+# Logs sur la sortie standard (rcuprs par Docker)
+accesslog = "-"
+errorlog = "-"
@@ -8,8 +8,8 @@ et leur division en ensembles d'entra
 import os
 import sys
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
 from src.exception import CustomException
 from src.logger import logging
@@ -20,12 +20,19 @@ class DataIngestionConfig:
     """
     Configuration pour l'ingestion de donnes
 
-    Dfinit les chemins o seront stockes les donnes brutes et divises
+    Dfinit la source des donnes ainsi que les chemins o seront stockes
+    les donnes brutes et divises (ensembles train/test au format Parquet,
+    plus compact et rapide  relire)
     """
-    train_data_path: str = os.path.join('data', 'train.csv')
-    test_data_path: str = os.path.join('data', 'test.csv')
+    source_data_path: str = os.path.join('data', 'raw', 'data.csv')
+    train_data_path: str = os.path.join('data', 'train.parquet')
+    test_data_path: str = os.path.join('data', 'test.parquet')
     raw_data_path: str = os.path.join('data', 'raw', 'data.csv')
 
+    # Paramtres de division train/test
+    test_size: float = 0.2
+    random_state: int = 42
+
 
 class DataIngestion:
     """
@@ -45,7 +52,7 @@ class DataIngestion:
 
         tapes :
         1. Lit les donnes depuis la source (ici un CSV d'exemple)
-        2. Sauvegarde les donnes brutes
+        2. Sauvegarde les donnes brutes (si la source diffre du fichier brut)
         3. Divise en train/test
         4. Retourne les chemins des fichiers crs
 
@@ -60,23 +67,36 @@ class DataIngestion:
         try:
             # Lecture des donnes depuis la source
             # Remplacer par votre source de donnes relle (DB, API, etc.)
-            df = pd.read_csv('data/raw/data.csv')
+            # Le moteur pyarrow lit le CSV en parallle sur plusieurs threads
+            source_path = self.ingestion_config.source_data_path
+            df = pd.read_csv(source_path, engine='pyarrow')
             logging.info("Lecture du dataset termine")
 
             # Cration des rpertoires si ncessaire
             os.makedirs(os.path.dirname(self.ingestion_config.train_data_path), exist_ok=True)
 
-            # Sauvegarde des donnes brutes
-            df.to_csv(self.ingestion_config.raw_data_path, index=False, header=True)
-            logging.info("Sauvegarde des donnes brutes effectue")
-
-            # Division train/test
+            # Sauvegarde des donnes brutes (inutile si la source est dj le fichier brut)
+            raw_data_path = self.ingestion_config.raw_data_path
+            if os.path.abspath(source_path) != os.path.abspath(raw_data_path):
+                os.makedirs(os.path.dirname(raw_data_path), exist_ok=True)
+                df.to_csv(raw_data_path, index=False, header=True)
+                logging.info("Sauvegarde des donnes brutes effectue")
+            else:
+                logging.info("Source identique aux donnes brutes, pas de rcriture")
+
+            # Division train/test sur une permutation alatoire des lignes :
+            # les ensembles sont mlangs (les plis de validation croise ne
+            # suivent pas l'ordre du fichier source) et la taille du test est exacte
             logging.info("Division train/test initie")
-            train_set, test_set = train_test_split(df, test_size=0.2, random_state=42)
-
-            # Sauvegarde des ensembles
-            train_set.to_csv(self.ingestion_config.train_data_path, index=False, header=True)
-            test_set.to_csv(self.ingestion_config.test_data_path, index=False, header=True)
+            rng = np.random.default_rng(self.ingestion_config.random_state)
+            indices = rng.permutation(len(df))
+            n_test = int(len(df) * self.ingestion_config.test_size)
+            test_set = df.iloc[indices[:n_test]]
+            train_set = df.iloc[indices[n_test:]]
+
+            # Sauvegarde des ensembles au format Parquet (compression zstd)
+            train_set.to_parquet(self.ingestion_config.train_data_path, index=False, compression='zstd')
+            test_set.to_parquet(self.ingestion_config.test_data_path, index=False, compression='zstd')
 
             logging.info("Ingestion de donnes termine avec succs")
 
@@ -3,7 +3,7 @@ Module de transformation de donn
 
 Ce module gre le prtraitement et la transformation des donnes :
 - Imputation des valeurs manquantes
-- Encodage des variables catgorielles
+- Encodage des variables catgorielles (one-hot, ou hachage pour les fortes cardinalits)
 - Normalisation/Standardisation des variables numriques
 - Cration du pipeline de transformation
 """
@@ -13,10 +13,12 @@ import os
 from dataclasses import dataclass
 import numpy as np
 import pandas as pd
+from scipy import sparse
 from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction import FeatureHasher
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
 
 from src.exception import CustomException
 from src.logger import logging
@@ -29,9 +31,127 @@ class DataTransformationConfig:
     Configuration pour la transformation de donnes
 
     Dfinit le chemin o sera sauvegard le preprocessor (pipeline de transformation)
+    ainsi que les colonnes numriques et catgorielles  traiter
     """
     preprocessor_obj_file_path: str = os.path.join('models', 'preprocessor.pkl')
 
+    # Colonnes numriques et catgorielles ( adapter selon votre dataset)
+    numerical_columns: tuple = ("feature1", "feature2", "feature3")
+    categorical_columns: tuple = ("category1", "category2")
+
+    # Colonnes catgorielles  forte cardinalit (sous-ensemble de categorical_columns)
+    # encodes par hachage ; les autres sont encodes en one-hot
+    high_cardinality_columns: tuple = ()
+
+    # Nombre de colonnes produites par le hachage des colonnes  forte cardinalit
+    categorical_hash_features: int = 2 ** 8
+
+
+def _concat_features_target(features, target):
+    """
+    Concatne les features transformes et la cible (dernire colonne) en float32
+
+    Si les features sont creuses (sparse), le rsultat reste creux pour ne pas
+    densifier les colonnes one-hot. Sinon, le tableau dense est allou une
+    seule fois puis rempli par tranches.
+
+    Args:
+        features: Features transformes (ndarray ou matrice scipy.sparse)
+        target: Srie pandas de la variable cible
+
+    Returns:
+        ndarray ou csr_matrix: Tableau (features + cible) en float32
+    """
+    target = target.to_numpy(dtype=np.float32)
+
+    if sparse.issparse(features):
+        return sparse.hstack(
+            [features, target.reshape(-1, 1)], format="csr", dtype=np.float32
+        )
+
+    n_rows, n_features = features.shape
+    combined = np.empty((n_rows, n_features + 1), dtype=np.float32)
+    combined[:, :-1] = features
+    combined[:, -1] = target
+    return combined
+
+
+def _categories_as_tokens(X, columns):
+    """
+    Convertit chaque ligne catgorielle en liste de jetons "colonne=valeur"
+
+    Format attendu par FeatureHasher (input_type="string"). Fonction de module
+    (et non lambda) pour que le preprocessor reste srialisable par pickle.
+
+    Args:
+        X: Tableau des valeurs catgorielles (une ligne par observation)
+        columns: Noms des colonnes catgorielles, dans l'ordre de X
+
+    Returns:
+        list: Liste de jetons par observation
+    """
+    return [[f"{column}={value}" for column, value in zip(columns, row)] for row in X]
+
+
+def _build_preprocessor(numerical_columns, categorical_columns, high_cardinality_columns,
+                        n_hash_features):
+    """
+    Construit le pipeline de transformation (non entran) pour des colonnes donnes
+
+    Args:
+        numerical_columns: Tuple des colonnes numriques
+        categorical_columns: Tuple des colonnes catgorielles
+        high_cardinality_columns: Tuple des colonnes catgorielles encodes par hachage
+        n_hash_features: Nombre de colonnes produites par le hachage des catgories
+
+    Returns:
+        ColumnTransformer: Pipeline de prtraitement non entran
+    """
+    # Pipeline pour les variables numriques
+    num_pipeline = Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="median")),  # Imputation valeurs manquantes
+            ("scaler", StandardScaler(copy=False))  # Standardisation (en place)
+        ]
+    )
+
+    transformers = [("num_pipeline", num_pipeline, list(numerical_columns))]
+
+    # Pipeline pour les variables catgorielles  faible cardinalit
+    one_hot_columns = [c for c in categorical_columns if c not in high_cardinality_columns]
+    if one_hot_columns:
+        cat_pipeline = Pipeline(
+            steps=[
+                ("imputer", SimpleImputer(strategy="most_frequent")),  # Imputation valeurs manquantes
+                # Encodage one-hot creux en float32 (catgories inconnues ignores en prdiction)
+                ("one_hot_encoder", OneHotEncoder(
+                    sparse_output=True, dtype=np.float32, handle_unknown="ignore"
+                ))
+            ]
+        )
+        transformers.append(("cat_pipeline", cat_pipeline, one_hot_columns))
+
+    # Pipeline pour les variables catgorielles  forte cardinalit
+    # Le hachage ne conserve aucun vocabulaire : mmoire constante quelle que soit
+    # la cardinalit, et les catgories inconnues sont gres en prdiction
+    hash_columns = [c for c in categorical_columns if c in high_cardinality_columns]
+    if hash_columns:
+        hash_pipeline = Pipeline(
+            steps=[
+                ("imputer", SimpleImputer(strategy="most_frequent")),  # Imputation valeurs manquantes
+                ("tokenizer", FunctionTransformer(
+                    _categories_as_tokens, kw_args={"columns": hash_columns}
+                )),  # Jetons "colonne=valeur"
+                ("hasher", FeatureHasher(
+                    n_features=n_hash_features, input_type="string", dtype=np.float32
+                ))  # Hachage en matrice creuse float32
+            ]
+        )
+        transformers.append(("hash_pipeline", hash_pipeline, hash_columns))
+
+    # Combinaison des pipelines (excuts en parallle pendant l'entranement)
+    return ColumnTransformer(transformers, n_jobs=-1)
+
 
 class DataTransformation:
     """
@@ -44,6 +164,7 @@ class DataTransformation:
     def __init__(self):
         """Initialise la configuration de transformation"""
         self.data_transformation_config = DataTransformationConfig()
+        self.preprocessor = None
 
     def get_data_transformer_object(self):
         """
@@ -52,6 +173,7 @@ class DataTransformation:
         Ce pipeline gre sparment les colonnes numriques et catgorielles :
         - Numriques : imputation mdiane + standardisation
         - Catgorielles : imputation mode + encodage one-hot
+        - Catgorielles  forte cardinalit : imputation mode + hachage (FeatureHasher)
 
         Returns:
             ColumnTransformer: Pipeline de prtraitement complet
@@ -60,37 +182,20 @@ class DataTransformation:
             CustomException: En cas d'erreur lors de la cration du pipeline
         """
         try:
-            # Colonnes numriques et catgorielles
-            #  adapter selon votre dataset
-            numerical_columns = ["feature1", "feature2", "feature3"]
-            categorical_columns = ["category1", "category2"]
-
-            # Pipeline pour les variables numriques
-            num_pipeline = Pipeline(
-                steps=[
-                    ("imputer", SimpleImputer(strategy="median")),  # Imputation valeurs manquantes
-                    ("scaler", StandardScaler())  # Standardisation
-                ]
-            )
-
-            # Pipeline pour les variables catgorielles
-            cat_pipeline = Pipeline(
-                steps=[
-                    ("imputer", SimpleImputer(strategy="most_frequent")),  # Imputation valeurs manquantes
-                    ("one_hot_encoder", OneHotEncoder()),  # Encodage one-hot
-                    ("scaler", StandardScaler(with_mean=False))  # Standardisation (sparse matrix)
-                ]
-            )
-
-            logging.info(f"Colonnes numriques : {numerical_columns}")
-            logging.info(f"Colonnes catgorielles : {categorical_columns}")
-
-            # Combinaison des deux pipelines
-            preprocessor = ColumnTransformer(
-                [
-                    ("num_pipeline", num_pipeline, numerical_columns),
-                    ("cat_pipeline", cat_pipeline, categorical_columns)
-                ]
+            # Colonnes numriques et catgorielles (dfinies dans la configuration)
+            numerical_columns = tuple(self.data_transformation_config.numerical_columns)
+            categorical_columns = tuple(self.data_transformation_config.categorical_columns)
+            high_cardinality_columns = tuple(self.data_transformation_config.high_cardinality_columns)
+
+            logging.info(f"Colonnes numriques : {list(numerical_columns)}")
+            logging.info(f"Colonnes catgorielles : {list(categorical_columns)}")
+            logging.info(f"Colonnes catgorielles haches : {list(high_cardinality_columns)}")
+
+            preprocessor = _build_preprocessor(
+                numerical_columns,
+                categorical_columns,
+                high_cardinality_columns,
+                self.data_transformation_config.categorical_hash_features
             )
 
             return preprocessor
@@ -115,14 +220,17 @@ class DataTransformation:
 
         Returns:
             tuple: (train_array, test_array, preprocessor_path)
+                Les tableaux sont en float32 (cible en dernire colonne) ;
+                ils restent creux (scipy.sparse) si le preprocessor produit
+                une sortie creuse.
 
         Raises:
             CustomException: En cas d'erreur lors de la transformation
         """
         try:
-            # Lecture des donnes
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            # Lecture des donnes (fichiers Parquet produits par l'ingestion)
+            train_df = pd.read_parquet(train_path)
+            test_df = pd.read_parquet(test_path)
 
             logging.info("Lecture des donnes train et test termine")
             logging.info("Obtention du preprocessor")
@@ -146,13 +254,13 @@ class DataTransformation:
             input_feature_train_arr = preprocessing_obj.fit_transform(input_feature_train_df)
             input_feature_test_arr = preprocessing_obj.transform(input_feature_test_df)
 
-            # Concatnation features transformes + target
-            train_arr = np.c_[
-                input_feature_train_arr, np.array(target_feature_train_df)
-            ]
-            test_arr = np.c_[
-                input_feature_test_arr, np.array(target_feature_test_df)
-            ]
+            # Concatnation features transformes + target (reste creux si sparse)
+            train_arr = _concat_features_target(input_feature_train_arr, target_feature_train_df)
+            test_arr = _concat_features_target(input_feature_test_arr, target_feature_test_df)
+
+            # Paralllisme rserv  l'entranement : en prdiction (quelques lignes),
+            # l'envoi aux processus loky coterait plus que la transformation elle-mme
+            preprocessing_obj.set_params(n_jobs=None)
 
             logging.info("Sauvegarde du preprocessor")
 
@@ -161,6 +269,7 @@ class DataTransformation:
                 file_path=self.data_transformation_config.preprocessor_obj_file_path,
                 obj=preprocessing_obj
             )
+            self.preprocessor = preprocessing_obj
 
             logging.info("Transformation des donnes termine avec succs")
 
@@ -178,4 +287,4 @@ class DataTransformation:
 # Exemple d'utilisation :
 if __name__ == "__main__":
     obj = DataTransformation()
-    # train_arr, test_arr, _ = obj.initiate_data_transformation("data/train.csv", "data/test.csv")
+    # train_arr, test_arr, _ = obj.initiate_data_transformation("data/train.parquet", "data/test.parquet")
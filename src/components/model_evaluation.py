@@ -5,13 +5,14 @@ Ce module g
 avec diffrentes mtriques et gnre des rapports de performance.
 """
 
+import os
 import sys
+import math
 from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+import numpy as np
 import pandas as pd
 from sklearn.metrics import (
-    mean_squared_error,
-    mean_absolute_error,
-    r2_score,
     accuracy_score,
     precision_score,
     recall_score,
@@ -20,7 +21,7 @@ from sklearn.metrics import (
 
 from src.exception import CustomException
 from src.logger import logging
-from src.utils.common import load_object
+from src.utils.common import load_object, split_features_target
 
 
 @dataclass
@@ -41,10 +42,36 @@ class ModelEvaluation:
     pour comparer les modles ou valider un modle en production.
     """
 
+    # Cache des objets chargs, partag entre les instances :
+    # {chemin: (date de modification du fichier, objet)}
+    _object_cache: Dict[str, Tuple[float, Any]] = {}
+
     def __init__(self):
         """Initialise la configuration d'valuation"""
         self.evaluation_config = ModelEvaluationConfig()
 
+    @classmethod
+    def _cached_load(cls, file_path):
+        """
+        Charge un objet sauvegard en rutilisant le cache si le fichier n'a pas chang
+
+        Args:
+            file_path: Chemin du fichier  charger
+
+        Returns:
+            object: Objet charg (depuis le cache ou depuis le disque)
+        """
+        mtime = os.path.getmtime(file_path)
+        cached = cls._object_cache.get(file_path)
+
+        if cached is not None and cached[0] == mtime:
+            logging.info(f"Objet rcupr depuis le cache : {file_path}")
+            return cached[1]
+
+        obj = load_object(file_path=file_path)
+        cls._object_cache[file_path] = (mtime, obj)
+        return obj
+
     def evaluate_regression_model(self, y_true, y_pred):
         """
         value un modle de rgression avec plusieurs mtriques
@@ -60,11 +87,25 @@ class ModelEvaluation:
             CustomException: En cas d'erreur lors de l'valuation
         """
         try:
-            # Calcul des mtriques de rgression
-            mse = mean_squared_error(y_true, y_pred)
-            mae = mean_absolute_error(y_true, y_pred)
-            rmse = mean_squared_error(y_true, y_pred, squared=False)
-            r2 = r2_score(y_true, y_pred)
+            # Conversion unique en tableaux NumPy puis calcul des rsidus
+            y_true = np.asarray(y_true, dtype=np.float64).ravel()
+            y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+            residuals = y_true - y_pred
+            n_samples = residuals.size
+
+            # Calcul des mtriques de rgression  partir des rsidus
+            ss_res = float(residuals @ residuals)
+            mse = ss_res / n_samples
+            rmse = math.sqrt(mse)
+            mae = float(np.abs(residuals).mean())
+
+            centered = y_true - y_true.mean()
+            ss_tot = float(centered @ centered)
+            if ss_tot == 0:
+                # Mme convention que sklearn.metrics.r2_score pour une cible constante
+                r2 = 1.0 if ss_res == 0 else 0.0
+            else:
+                r2 = 1 - ss_res / ss_tot
 
             metrics = {
                 "MSE": mse,
@@ -117,21 +158,35 @@ class ModelEvaluation:
             logging.error("Erreur lors de l'valuation du modle de classification")
             raise CustomException(e, sys)
 
-    def initiate_model_evaluation(self, test_data_path, model_path, preprocessor_path):
+    def initiate_model_evaluation(
+        self,
+        *,
+        test_arr=None,
+        test_data_path=None,
+        model=None,
+        model_path=None,
+        preprocessor=None,
+        preprocessor_path=None
+    ):
         """
         Lance l'valuation complte d'un modle sur les donnes de test
 
         tapes :
-        1. Charge les donnes de test
-        2. Charge le modle et le preprocessor
-        3. Applique les transformations
-        4. Gnre les prdictions
-        5. Calcule les mtriques de performance
+        1. Charge le modle (sauf s'il est fourni)
+        2. Rcupre les donnes de test transformes : directement depuis
+           test_arr si fourni, sinon lecture de test_data_path puis
+           transformation avec le preprocessor
+        3. Gnre les prdictions
+        4. Calcule les mtriques de performance
 
         Args:
-            test_data_path: Chemin vers les donnes de test
+            test_arr: Donnes de test dj transformes (features + cible en
+                dernire colonne), vite la relecture et la re-transformation
+            test_data_path: Chemin vers les donnes de test (si test_arr absent)
+            model: Modle dj en mmoire (vite le chargement depuis model_path)
             model_path: Chemin vers le modle sauvegard
-            preprocessor_path: Chemin vers le preprocessor sauvegard
+            preprocessor: Preprocessor dj en mmoire (vite le chargement depuis preprocessor_path)
+            preprocessor_path: Chemin vers le preprocessor sauvegard (si test_arr absent)
 
         Returns:
             dict: Rapport d'valuation avec toutes les mtriques
@@ -142,25 +197,37 @@ class ModelEvaluation:
         try:
             logging.info("Dmarrage de l'valuation du modle")
 
-            # Chargement des donnes de test
-            test_df = pd.read_csv(test_data_path)
-            logging.info("Donnes de test charges")
+            # Chargement du modle (uniquement s'il n'est pas fourni)
+            if model is None:
+                model = self._cached_load(model_path)
+
+            logging.info("Modle charg")
+
+            if test_arr is not None:
+                # Donnes dj transformes en mmoire : pas de relecture du fichier
+                X_test_transformed, y_test = split_features_target(test_arr)
+                logging.info("Donnes de test transformes fournies en mmoire")
+
+            else:
+                # Chargement des donnes de test (fichier Parquet produit par l'ingestion)
+                test_df = pd.read_parquet(test_data_path)
+                logging.info("Donnes de test charges")
 
-            # Nom de la colonne cible ( adapter)
-            target_column = "target"
+                # Nom de la colonne cible ( adapter)
+                target_column = "target"
 
-            # Sparation features/target
-            X_test = test_df.drop(columns=[target_column], axis=1)
-            y_test = test_df[target_column]
+                # Sparation features/target
+                X_test = test_df.drop(columns=[target_column], axis=1)
+                y_test = test_df[target_column]
 
-            # Chargement du modle et du preprocessor
-            model = load_object(file_path=model_path)
-            preprocessor = load_object(file_path=preprocessor_path)
+                # Chargement du preprocessor (uniquement s'il n'est pas fourni)
+                if preprocessor is None:
+                    preprocessor = self._cached_load(preprocessor_path)
 
-            logging.info("Modle et preprocessor chargs")
+                logging.info("Preprocessor charg")
 
-            # Transformation des features
-            X_test_transformed = preprocessor.transform(X_test)
+                # Transformation des features
+                X_test_transformed = preprocessor.transform(X_test)
 
             # Gnration des prdictions
             y_pred = model.predict(X_test_transformed)
@@ -188,7 +255,7 @@ class ModelEvaluation:
 if __name__ == "__main__":
     # obj = ModelEvaluation()
     # metrics = obj.initiate_model_evaluation(
-    #     test_data_path="data/test.csv",
+    #     test_data_path="data/test.parquet",
     #     model_path="models/model.pkl",
     #     preprocessor_path="models/preprocessor.pkl"
     # )
@@ -22,6 +22,23 @@ def error_message_detail(error, error_detail: sys):
         str: Message d'erreur format avec le contexte complet
     """
     _, _, exc_tb = error_detail.exc_info()
+    return _format_error(error, exc_tb)
+
+
+def _format_error(error, exc_tb):
+    """
+    Formate le message d'erreur  partir d'un traceback dj captur
+
+    Args:
+        error: L'exception leve (ou un message)
+        exc_tb: Traceback associ, ou None si leve hors d'un bloc except
+
+    Returns:
+        str: Message d'erreur format
+    """
+    if exc_tb is None:
+        return str(error)
+
     file_name = exc_tb.tb_frame.f_code.co_filename
     line_number = exc_tb.tb_lineno
 
@@ -36,19 +53,29 @@ class CustomException(Exception):
     """
     Classe d'exception personnalise pour le projet
 
-    Hrite de Exception et ajoute des informations dtailles sur le contexte de l'erreur
+    Hrite de Exception et ajoute des informations dtailles sur le contexte de l'erreur.
+    Le message dtaill n'est construit qu'au premier affichage de l'exception.
     """
 
     def __init__(self, error_message, error_detail: sys):
         """
-        Initialise l'exception avec un message dtaill
+        Initialise l'exception (seul le traceback courant est conserv)
 
         Args:
             error_message: Message d'erreur de base
             error_detail: sys module pour extraire le traceback
         """
         super().__init__(error_message)
-        self.error_message = error_message_detail(error_message, error_detail=error_detail)
+        self._error = error_message
+        self._exc_info = error_detail.exc_info()
+        self._formatted = None
+
+    @property
+    def error_message(self):
+        """Message d'erreur dtaill (fichier, ligne, message), calcul  la demande"""
+        if self._formatted is None:
+            self._formatted = _format_error(self._error, self._exc_info[2])
+        return self._formatted
 
     def __str__(self):
         return self.error_message
@@ -3,25 +3,62 @@ Module de configuration du syst
 
 Ce module configure le systme de journalisation pour l'ensemble du projet.
 Il cre des logs avec horodatage dans le dossier 'logs/' pour tracer
-l'excution et faciliter le dbogage.
+l'excution et faciliter le dbogage. Chaque processus crit dans son
+propre fichier (date + PID), cr  l'criture du premier message et non
+ l'import.
 """
 
 import os
 import logging
 from datetime import datetime
 
-# Nom du fichier de log avec timestamp
-LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
-
 # Chemin complet du dossier de logs
-logs_path = os.path.join(os.getcwd(), "logs", LOG_FILE)
+LOGS_DIR = os.path.join(os.getcwd(), "logs")
+
+
+def _log_file_path():
+    """
+    Chemin du fichier de log du processus courant
+
+    Returns:
+        str: logs/<date du jour>_pid<PID>.log
+    """
+    return os.path.join(LOGS_DIR, f"{datetime.now().strftime('%Y_%m_%d')}_pid{os.getpid()}.log")
+
+
+class LazyFileHandler(logging.FileHandler):
+    """
+    FileHandler qui n'ouvre son fichier qu'au premier message mis
+
+    Le nom du fichier est rsolu  l'ouverture et non  l'import : sous
+    gunicorn avec preload_app, chaque worker fork crit dans son propre
+    fichier. Un fichier hrit du processus parent est ferm puis rouvert
+    au nom du processus courant.
+    """
+
+    def __init__(self):
+        """Initialise le handler sans ouvrir de fichier"""
+        super().__init__(_log_file_path(), delay=True)
+        self._pid = None
+
+    def _open(self):
+        # Nom du fichier et cration du dossier logs au moment de l'ouverture
+        self.baseFilename = _log_file_path()
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        self._pid = os.getpid()
+        return super()._open()
+
+    def emit(self, record):
+        # Fichier ouvert par le processus parent avant le fork : rouvert pour ce processus
+        if self.stream is not None and self._pid != os.getpid():
+            self.stream.close()
+            self.stream = None
+        super().emit(record)
 
-# Cration du dossier logs s'il n'existe pas
-os.makedirs(os.path.dirname(logs_path), exist_ok=True)
 
 # Configuration du logger
 logging.basicConfig(
-    filename=logs_path,
+    handlers=[LazyFileHandler()],
     format="[%(asctime)s] %(lineno)d %(name)s - %(levelname)s - %(message)s",
     level=logging.INFO,
 )
@@ -7,10 +7,11 @@ Contient les pipelines d'orchestration :
 """
 
 from src.pipeline.training_pipeline import TrainingPipeline
-from src.pipeline.prediction_pipeline import PredictPipeline, CustomData
+from src.pipeline.prediction_pipeline import PredictPipeline, PredictionBatcher, CustomData
 
 __all__ = [
     "TrainingPipeline",
     "PredictPipeline",
+    "PredictionBatcher",
     "CustomData",
 ]
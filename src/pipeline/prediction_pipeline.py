@@ -5,10 +5,17 @@ Ce module g
 - Chargement du modle et du preprocessor
 - Transformation des donnes d'entre
 - Gnration de prdictions
+- Regroupement (micro-batching) des prdictions unitaires concurrentes
 """
 
+import os
 import sys
+import time
+import queue
+import threading
+from concurrent.futures import Future
 import pandas as pd
+from src.components.data_transformation import DataTransformationConfig
 from src.exception import CustomException
 from src.logger import logging
 from src.utils.common import load_object
@@ -18,14 +25,34 @@ class PredictPipeline:
     """
     Classe grant le pipeline de prdiction
 
-    Charge le modle entran et le preprocessor, puis gnre des prdictions
-    sur de nouvelles donnes.
+    Charge le modle entran et le preprocessor une seule fois (au premier
+    appel de predict), puis gnre des prdictions sur de nouvelles donnes.
     """
 
     def __init__(self):
         """Initialise le pipeline de prdiction"""
         logging.info("Initialisation du pipeline de prdiction")
 
+        # Chemins des fichiers modle et preprocessor
+        self.model_path = 'models/model.pkl'
+        self.preprocessor_path = 'models/preprocessor.pkl'
+
+        # Objets chargs  la demande puis rutiliss entre les appels
+        self._model = None
+        self._preprocessor = None
+        self._load_lock = threading.Lock()
+
+    def _load_artifacts(self):
+        """Charge le modle et le preprocessor s'ils ne sont pas dj en mmoire"""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    logging.info("Chargement du modle et du preprocessor")
+                    self._preprocessor = load_object(file_path=self.preprocessor_path)
+                    self._model = load_object(file_path=self.model_path)
+
+        return self._model, self._preprocessor
+
     def predict(self, features):
         """
         Gnre des prdictions sur de nouvelles donnes
@@ -42,14 +69,8 @@ class PredictPipeline:
         try:
             logging.info("Dbut de la prdiction")
 
-            # Chemins des fichiers modle et preprocessor
-            model_path = 'models/model.pkl'
-            preprocessor_path = 'models/preprocessor.pkl'
-
-            # Chargement du modle et du preprocessor
-            logging.info("Chargement du modle et du preprocessor")
-            model = load_object(file_path=model_path)
-            preprocessor = load_object(file_path=preprocessor_path)
+            # Modle et preprocessor (chargs une seule fois)
+            model, preprocessor = self._load_artifacts()
 
             # Transformation des donnes
             logging.info("Transformation des donnes d'entre")
@@ -67,33 +88,118 @@ class PredictPipeline:
             raise CustomException(e, sys)
 
 
+class PredictionBatcher:
+    """
+    Classe regroupant les prdictions unitaires concurrentes en lots
+
+    Un thread de fond vide une file d'attente de requtes et appelle la fonction
+    de prdiction une seule fois par lot : le cot fixe du preprocessing et du
+    modle est ainsi partag entre toutes les observations du lot.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5):
+        """
+        Initialise le regroupeur de prdictions
+
+        Args:
+            predict_fn: Fonction recevant une liste d'observations (dict)
+                et retournant une prdiction par observation
+            max_batch_size: Nombre maximum d'observations par lot
+            max_wait_ms: Attente maximale (ms) pour complter un lot
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker_pid = None
+
+    def submit(self, features):
+        """
+        Ajoute une observation  la file d'attente
+
+        Args:
+            features: Dictionnaire des features d'une observation
+
+        Returns:
+            Future: Rsultat futur contenant la prdiction de l'observation
+        """
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((features, future))
+        return future
+
+    def _ensure_worker(self):
+        """Dmarre le thread de fond (une fois par processus, y compris aprs un fork)"""
+        pid = os.getpid()
+        if self._worker_pid == pid:
+            return
+
+        with self._lock:
+            if self._worker_pid != pid:
+                self._queue = queue.Queue()
+                worker = threading.Thread(
+                    target=self._run, name="prediction-batcher", daemon=True
+                )
+                worker.start()
+                self._worker_pid = pid
+
+    def _run(self):
+        """Boucle du thread de fond : constitue les lots puis les prdit"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            self._process_batch(batch)
+
+    def _process_batch(self, batch):
+        """
+        Prdit un lot et transmet chaque rsultat  la requte correspondante
+
+        Args:
+            batch: Liste de tuples (features, Future)
+        """
+        rows = [features for features, _ in batch]
+
+        try:
+            results = self.predict_fn(rows)
+        except Exception as e:
+            logging.error(f"Erreur lors de la prdiction d'un lot de {len(rows)} observations")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
 class CustomData:
     """
     Classe pour structurer les donnes d'entre personnalises
 
     Permet de crer facilement un DataFrame  partir de valeurs individuelles
-    pour effectuer des prdictions.
+    pour effectuer des prdictions. Les colonnes attendues sont celles du
+    preprocessor (DataTransformationConfig).
     """
 
-    def __init__(
-        self,
-        feature1: float,
-        feature2: float,
-        feature3: str,
-        # Ajouter tous vos features ici
-    ):
+    def __init__(self, **features):
         """
         Initialise les donnes personnalises
 
         Args:
-            feature1: Premire feature numrique
-            feature2: Deuxime feature numrique
-            feature3: Feature catgorielle
-            ...
+            **features: Valeur de chaque feature (colonnes numriques et catgorielles
+                de DataTransformationConfig), par exemple feature1=10.5, category1="A"
         """
-        self.feature1 = feature1
-        self.feature2 = feature2
-        self.feature3 = feature3
+        self.features = features
 
     def get_data_as_dataframe(self):
         """
@@ -106,19 +212,17 @@ class CustomData:
             CustomException: En cas d'erreur lors de la conversion
         """
         try:
-            # Cration d'un dictionnaire avec les donnes
-            custom_data_input_dict = {
-                "feature1": [self.feature1],
-                "feature2": [self.feature2],
-                "feature3": [self.feature3],
-                # Ajouter tous vos features ici
-            }
+            # Un seul enregistrement, colonnes et types connus  l'avance
+            # (le DataFrame est conserv car le preprocessor slectionne les colonnes par nom)
+            transformation_config = DataTransformationConfig()
+            schema = {column: "float64" for column in transformation_config.numerical_columns}
+            schema.update({column: "object" for column in transformation_config.categorical_columns})
 
-            # Conversion en DataFrame
-            df = pd.DataFrame(custom_data_input_dict)
+            df = pd.DataFrame.from_records([self.features], columns=list(schema))
+            df = df.astype(schema, copy=False)
 
             logging.info("Donnes converties en DataFrame")
-            logging.info(f"Colonnes du DataFrame : {df.columns.tolist()}")
+            logging.debug(f"Colonnes du DataFrame : {df.columns.tolist()}")
 
             return df
 
@@ -134,7 +238,9 @@ if __name__ == "__main__":
         data = CustomData(
             feature1=10.5,
             feature2=20.3,
-            feature3="category_A"
+            feature3=1.2,
+            category1="A",
+            category2="X"
         )
 
         # Conversion en DataFrame
@@ -65,17 +65,21 @@ class TrainingPipeline:
             # tape 3 : Entranement du modle
             logging.info("\n--- TAPE 3 : ENTRANEMENT DU MODLE ---")
             model_trainer = ModelTrainer()
-            model_score = model_trainer.initiate_model_trainer(train_arr, test_arr)
+            model_score = model_trainer.initiate_model_trainer(
+                train_arr, test_arr, preprocessor=data_transformation.preprocessor
+            )
 
             logging.info(f"Score R2 du modle entran : {model_score}")
 
             # tape 4 : valuation du modle
             logging.info("\n--- TAPE 4 : VALUATION DU MODLE ---")
             model_evaluation = ModelEvaluation()
+            # Le modle et les donnes de test transformes sont dj en mmoire :
+            # ni rechargement du modle, ni relecture/re-transformation du fichier de test
             metrics = model_evaluation.initiate_model_evaluation(
-                test_data_path=test_data_path,
-                model_path=model_trainer.model_trainer_config.trained_model_file_path,
-                preprocessor_path=preprocessor_path
+                test_arr=test_arr,
+                model=model_trainer.best_model,
+                model_path=model_trainer.model_trainer_config.trained_model_file_path
             )
 
             # Rsum des rsultats
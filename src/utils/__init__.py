@@ -5,6 +5,7 @@ Contient les fonctions utilitaires r
 - Sauvegarde/Chargement d'objets
 - Lecture/criture de fichiers YAML/JSON
 - valuation de modles
+- Sparation features/cible
 - Cration de rpertoires
 """
 
@@ -16,6 +17,7 @@ from src.utils.common import (
     read_json,
     write_json,
     evaluate_models,
+    split_features_target,
     create_directories,
 )
 
@@ -27,5 +29,6 @@ __all__ = [
     "read_json",
     "write_json",
     "evaluate_models",
+    "split_features_target",
     "create_directories",
 ]
@@ -5,6 +5,7 @@ Ce module contient des fonctions r
 - Sauvegarde/Chargement d'objets (modles, preprocessors)
 - Lecture de fichiers YAML/JSON
 - valuation de modles
+- Sparation features/cible
 - Autres utilitaires divers
 """
 
@@ -14,21 +15,54 @@ import pickle
 import yaml
 import json
 import dill
+import joblib
 import numpy as np
+from joblib import Parallel, delayed
+from scipy import sparse
+from threadpoolctl import threadpool_limits
 from sklearn.metrics import r2_score
-from sklearn.model_selection import GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, ParameterGrid
 
 from src.exception import CustomException
 from src.logger import logging
 
+# Compression lz4 (optionnelle) : repli sur zlib si le paquet n'est pas install
+try:
+    import lz4  # noqa: F401
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
 
-def save_object(file_path, obj):
+
+def _resolve_compress(compress):
+    """
+    Remplace la compression lz4 par zlib (mme niveau) si lz4 n'est pas disponible
+
+    Args:
+        compress: Paramtre de compression joblib (entier ou tuple (algorithme, niveau))
+
+    Returns:
+        Paramtre de compression utilisable par joblib
+    """
+    if isinstance(compress, tuple) and compress[0] == "lz4" and not LZ4_AVAILABLE:
+        return ("zlib", compress[1])
+    return compress
+
+
+def save_object(file_path, obj, compress=('lz4', 3)):
     """
-    Sauvegarde un objet Python dans un fichier pickle
+    Sauvegarde un objet Python avec joblib
+
+    Par dfaut le fichier est compress en lz4 (zlib si lz4 n'est pas install) :
+    fichier plus petit et dcompression plus rapide que la lecture disque.
+    Les objets non srialisables par pickle (lambdas, fonctions locales)
+    sont sauvegards avec dill.
 
     Args:
         file_path: Chemin du fichier de destination
         obj: Objet  sauvegarder
+        compress: Compression joblib, ex. 3 ou ('lz4', 3) (0 = pas de compression)
 
     Raises:
         CustomException: En cas d'erreur lors de la sauvegarde
@@ -37,8 +71,18 @@ def save_object(file_path, obj):
         dir_path = os.path.dirname(file_path)
         os.makedirs(dir_path, exist_ok=True)
 
-        with open(file_path, "wb") as file_obj:
-            pickle.dump(obj, file_obj)
+        try:
+            joblib.dump(
+                obj,
+                file_path,
+                compress=_resolve_compress(compress),
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        except (pickle.PicklingError, AttributeError):
+            logging.warning(f"Objet non srialisable par pickle, utilisation de dill : {file_path}")
+            # Tampon d'criture de 1 Mo : moins d'appels systme pour les nombreux petits tableaux
+            with open(file_path, "wb", buffering=1 << 20) as file_obj:
+                dill.dump(obj, file_obj, protocol=pickle.HIGHEST_PROTOCOL)
 
         logging.info(f"Objet sauvegard : {file_path}")
 
@@ -49,7 +93,7 @@ def save_object(file_path, obj):
 
 def load_object(file_path):
     """
-    Charge un objet Python depuis un fichier pickle
+    Charge un objet Python sauvegard avec save_object
 
     Args:
         file_path: Chemin du fichier  charger
@@ -61,8 +105,7 @@ def load_object(file_path):
         CustomException: En cas d'erreur lors du chargement
     """
     try:
-        with open(file_path, "rb") as file_obj:
-            obj = pickle.load(file_obj)
+        obj = joblib.load(file_path)
 
         logging.info(f"Objet charg : {file_path}")
         return obj
@@ -172,12 +215,116 @@ def write_json(file_path, content):
         raise CustomException(e, sys)
 
 
-def evaluate_models(X_train, y_train, X_test, y_test, models, param):
+def _build_search(model, params, n_jobs=-1, cv=3, verbose=0):
+    """
+    Construit la recherche d'hyperparamtres par halving successif
+
+    Tous les candidats de la grille (y compris n_estimators / max_iter, qui
+    sont recherchs comme les autres hyperparamtres) sont d'abord valus
+    sur un petit sous-chantillon de X_train, puis seul le meilleur tiers
+    passe  l'itration suivante avec trois fois plus d'chantillons. La
+    dernire itration utilise tout X_train.
+
+    Args:
+        model: Instance du modle  optimiser
+        params: Grille d'hyperparamtres {nom: liste de valeurs}
+        n_jobs: Nombre de processus utiliss par la validation croise
+        cv: Nombre de plis de la validation croise
+        verbose: Niveau de verbosit de la recherche (0 = silencieux)
+
+    Returns:
+        HalvingGridSearchCV: Recherche prte  tre entrane
+    """
+    return HalvingGridSearchCV(
+        model,
+        params,
+        resource="n_samples",
+        min_resources="exhaust",
+        factor=3,
+        cv=cv,
+        n_jobs=n_jobs,
+        verbose=verbose
+    )
+
+
+def _fit_one(model_name, model, params, X_train, y_train, X_test, y_test, n_jobs, cv=3, verbose=0,
+             train_score=False):
+    """
+    Optimise, entrane et value un seul modle (excut dans un processus worker)
+
+    Rien n'est journalis ici : le worker crirait dans son propre fichier de log.
+    Les dtails sont retourns et journaliss par le processus principal.
+
+    Args:
+        model_name: Nom du modle
+        model: Instance du modle
+        params: Grille d'hyperparamtres du modle (vide si aucune)
+        X_train: Features d'entranement
+        y_train: Target d'entranement
+        X_test: Features de test
+        y_test: Target de test
+        n_jobs: Nombre de threads allous  ce modle
+        cv: Nombre de plis de la validation croise
+        verbose: Niveau de verbosit de la recherche
+        train_score: Si True, calcule aussi le score R2 sur X_train
+
+    Returns:
+        tuple: (model_name, test_score, modle entran, meilleurs paramtres
+            (None sans recherche), score R2 train (None si non calcul))
+    """
+    best_params = None
+    train_r2 = None
+
+    # Budget de threads du worker transmis  l'estimateur (XGBoost, Random Forest...) :
+    # un n_jobs explicite passerait outre threadpool_limits
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+
+    # Limite les threads BLAS/OpenMP au mme budget (pas de sur-souscription)
+    with threadpool_limits(limits=n_jobs):
+        n_candidates = len(ParameterGrid(params)) if params else 0
+
+        if n_candidates > 1:
+            # Optimisation par halving successif (limination prcoce des mauvais candidats)
+            # La recherche reste squentielle : pas de second niveau de processus dans le worker
+            gs = _build_search(model, params, n_jobs=1, cv=cv, verbose=verbose)
+            gs.fit(X_train, y_train)
+
+            # Meilleur modle, dj rentran sur tout X_train par la recherche (refit=True)
+            model = gs.best_estimator_
+            best_params = gs.best_params_
+
+        else:
+            if params:
+                # Un seul candidat : la recherche ne serait qu'une validation croise inutile
+                model.set_params(**ParameterGrid(params)[0])
+
+            # Entranement unique sur tout X_train
+            model.fit(X_train, y_train)
+
+        # Prdictions sur le test (seules utilises pour le rapport)
+        y_test_pred = model.predict(X_test)
+
+        # Score train uniquement sur demande : vite une prdiction complte sur X_train
+        if train_score:
+            train_r2 = r2_score(y_train, model.predict(X_train))
+
+    test_score = r2_score(y_test, y_test_pred)
+
+    return model_name, test_score, model, best_params, train_r2
+
+
+def evaluate_models(X_train, y_train, X_test, y_test, models, param, cv=3, verbose=0):
     """
     value plusieurs modles avec optimisation des hyperparamtres
 
-    Entrane chaque modle avec GridSearchCV pour trouver les meilleurs
-    hyperparamtres, puis value sur le jeu de test.
+    Entrane chaque modle avec une recherche par halving successif
+    (HalvingGridSearchCV) pour trouver les meilleurs hyperparamtres,
+    puis value sur le jeu de test.
+
+    Les modles sont valus en parallle (un processus par modle) et les
+    processeurs sont rpartis entre eux : chaque modle dispose d'un budget
+    de threads, utilis par l'estimateur et les bibliothques BLAS/OpenMP.
 
     Args:
         X_train: Features d'entranement
@@ -186,46 +333,69 @@ def evaluate_models(X_train, y_train, X_test, y_test, models, param):
         y_test: Target de test
         models: Dictionnaire {nom_modle: instance_modle}
         param: Dictionnaire {nom_modle: grille_hyperparamtres}
+        cv: Nombre de plis de la validation croise (ex. 3 ou 5)
+        verbose: Niveau de verbosit des recherches (0 = aucune sortie par pli)
 
     Returns:
-        dict: {nom_modle: score_r2_test}
+        tuple: (report, fitted_models)
+            - report : {nom_modle: score_r2_test}
+            - fitted_models : {nom_modle: modle entran avec les meilleurs hyperparamtres}
 
     Raises:
         CustomException: En cas d'erreur lors de l'valuation
     """
     try:
         report = {}
+        fitted_models = {}
 
-        for i, (model_name, model) in enumerate(models.items()):
-            logging.info(f"\nvaluation du modle {i+1}/{len(models)} : {model_name}")
-
-            # Rcupration des hyperparamtres
-            params = param.get(model_name, {})
-
-            if params:
-                # Optimisation avec GridSearchCV
-                gs = GridSearchCV(model, params, cv=3, n_jobs=-1, verbose=1)
-                gs.fit(X_train, y_train)
+        # Rpartition des processeurs : un processus par modle, un budget de threads chacun
+        total_cores = os.cpu_count() or 1
+        n_workers = max(1, min(len(models), total_cores))
+        threads_per_worker = max(1, total_cores // n_workers)
 
-                # Meilleur modle
-                model.set_params(**gs.best_params_)
-                logging.info(f"Meilleurs paramtres pour {model_name} : {gs.best_params_}")
+        logging.info(
+            f"valuation de {len(models)} modles : {n_workers} processus, "
+            f"{threads_per_worker} thread(s) par modle"
+        )
 
-            # Entranement du modle
-            model.fit(X_train, y_train)
-
-            # Prdictions
-            y_train_pred = model.predict(X_train)
-            y_test_pred = model.predict(X_test)
-
-            # Calcul des scores
-            train_score = r2_score(y_train, y_train_pred)
-            test_score = r2_score(y_test, y_test_pred)
-
-            logging.info(f"Score R2 train : {train_score:.4f}")
-            logging.info(f"Score R2 test : {test_score:.4f}")
+        for model_name in models:
+            params = param.get(model_name, {})
+            if params and len(ParameterGrid(params)) == 1:
+                logging.warning(
+                    f"Grille  un seul candidat pour {model_name} : entranement direct sans recherche"
+                )
+
+        # Score train uniquement en mode debug (niveau du processus principal)
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+        results = Parallel(n_jobs=n_workers, backend="loky")(
+            delayed(_fit_one)(
+                model_name,
+                model,
+                param.get(model_name, {}),
+                X_train,
+                y_train,
+                X_test,
+                y_test,
+                threads_per_worker,
+                cv=cv,
+                verbose=verbose,
+                train_score=debug
+            )
+            for model_name, model in models.items()
+        )
+
+        # Journalisation dans le processus principal (mme fichier de log que l'entranement)
+        for model_name, test_score, fitted_model, best_params, train_score in results:
+            logging.info(f"\nvaluation du modle : {model_name}")
+            if best_params is not None:
+                logging.debug(f"Meilleurs paramtres pour {model_name} : {best_params}")
+            if train_score is not None:
+                logging.debug(f"Score R2 train ({model_name}) : {train_score:.4f}")
+            logging.info(f"Score R2 test ({model_name}) : {test_score:.4f}")
 
             report[model_name] = test_score
+            fitted_models[model_name] = fitted_model
 
         logging.info("\n" + "=" * 80)
         logging.info("RAPPORT D'VALUATION DES MODLES")
@@ -234,13 +404,34 @@ def evaluate_models(X_train, y_train, X_test, y_test, models, param):
             logging.info(f"{model_name:30} : R2 = {score:.4f}")
         logging.info("=" * 80)
 
-        return report
+        return report, fitted_models
 
     except Exception as e:
         logging.error("Erreur lors de l'valuation des modles")
         raise CustomException(e, sys)
 
 
+def split_features_target(array):
+    """
+    Spare un tableau (features + cible en dernire colonne) en X et y
+
+    Gre les tableaux denses et creux (scipy.sparse) produits par la transformation.
+
+    Args:
+        array: Tableau combin features + cible
+
+    Returns:
+        tuple: (X, y) avec y sous forme de vecteur dense
+    """
+    X = array[:, :-1]
+    y = array[:, -1]
+
+    if sparse.issparse(array):
+        y = y.toarray().ravel()
+
+    return X, y
+
+
 def create_directories(path_list):
     """
     Cre une liste de rpertoires
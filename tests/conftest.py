@@ -0,0 +1,39 @@
+"""
+Fixtures partages par les tests
+
+Fournit un petit jeu de donnes synthtique ayant les colonnes attendues
+par le preprocessor (DataTransformationConfig).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.data_transformation import DataTransformationConfig
+
+
+@pytest.fixture
+def training_frame():
+    """
+    Jeu de donnes synthtique (features + colonne "target")
+
+    La cible dpend linairement des features numriques et d'une catgorie,
+    ce qui permet aux modles de dpasser le seuil de performance.
+
+    Returns:
+        DataFrame: 400 observations
+    """
+    config = DataTransformationConfig()
+    rng = np.random.default_rng(0)
+    n_rows = 400
+
+    df = pd.DataFrame({column: rng.normal(size=n_rows) for column in config.numerical_columns})
+    for column in config.categorical_columns:
+        df[column] = rng.choice(["A", "B", "C"], size=n_rows)
+
+    df["target"] = (
+        df[list(config.numerical_columns)].to_numpy() @ np.arange(1, len(config.numerical_columns) + 1)
+        + 2.0 * (df[config.categorical_columns[0]] == "A")
+        + rng.normal(scale=0.1, size=n_rows)
+    )
+    return df
@@ -0,0 +1,117 @@
+"""
+Tests de l'API de prdiction (app.py)
+"""
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+import app
+from src.components.data_transformation import DataTransformation
+from src.pipeline.prediction_pipeline import PredictPipeline
+from src.utils.common import save_object
+
+
+def test_feature_schema_matches_preprocessor_columns(training_frame):
+    """Les colonnes de l'API sont exactement celles vues par le preprocessor"""
+    preprocessor = DataTransformation().get_data_transformer_object()
+    preprocessor.fit(training_frame.drop(columns=["target"]))
+
+    assert set(app.FEATURE_COLUMNS) == set(preprocessor.feature_names_in_)
+
+
+def test_payload_round_trips_through_fitted_preprocessor(training_frame):
+    """Une observation JSON passe par _to_dataframe puis par un preprocessor entran"""
+    features = training_frame.drop(columns=["target"])
+    preprocessor = DataTransformation().get_data_transformer_object()
+    preprocessor.fit(features)
+
+    payload = features.iloc[0].to_dict()
+    df = app._to_dataframe([payload])
+    transformed = preprocessor.transform(df)
+
+    assert transformed.shape[0] == 1
+    expected = preprocessor.transform(features.iloc[[0]])
+    np.testing.assert_allclose(transformed, expected)
+
+
+def test_default_warmup_row_is_accepted_by_preprocessor(training_frame):
+    """L'observation de prchauffage par dfaut a toutes les colonnes attendues"""
+    preprocessor = DataTransformation().get_data_transformer_object()
+    preprocessor.fit(training_frame.drop(columns=["target"]))
+
+    transformed = preprocessor.transform(app._to_dataframe([app.DEFAULT_WARMUP_ROW]))
+
+    assert transformed.shape[0] == 1
+
+
+def _valid_row(training_frame):
+    """Premire observation du jeu synthtique, au format JSON de l'API"""
+    return training_frame.drop(columns=["target"]).iloc[0].to_dict()
+
+
+def test_feature_errors_accepts_valid_row(training_frame):
+    """Une observation complte et bien type est accepte"""
+    assert app._feature_errors(_valid_row(training_frame)) is None
+
+
+def test_predict_rejects_missing_and_unknown_features(training_frame):
+    """/predict renvoie 400 si une feature manque ou est inconnue"""
+    client = app.app.test_client()
+    row = _valid_row(training_frame)
+
+    missing = {key: value for key, value in row.items() if key != "category1"}
+    response = client.post("/predict", json=missing)
+    assert response.status_code == 400
+    assert "category1" in response.get_json()["message"]
+
+    unknown = {**row, "extra": 1.0}
+    response = client.post("/predict", json=unknown)
+    assert response.status_code == 400
+    assert "extra" in response.get_json()["message"]
+
+
+def test_predict_rejects_non_numeric_value(training_frame):
+    """/predict renvoie 400 si une feature numrique n'est pas un nombre"""
+    client = app.app.test_client()
+    row = {**_valid_row(training_frame), "feature1": "abc"}
+
+    response = client.post("/predict", json=row)
+
+    assert response.status_code == 400
+    assert "feature1" in response.get_json()["message"]
+
+
+def test_batch_predict_reports_first_invalid_row(training_frame):
+    """/batch_predict renvoie 400 avec l'indice de la premire observation invalide"""
+    client = app.app.test_client()
+    row = _valid_row(training_frame)
+    invalid = {key: value for key, value in row.items() if key != "feature2"}
+
+    response = client.post("/batch_predict", json={"data": [row, invalid]})
+
+    assert response.status_code == 400
+    assert response.get_json()["message"].startswith("Observation 1")
+
+
+def test_predict_form_uses_feature_schema(training_frame, tmp_path, monkeypatch):
+    """/predict_form affiche un champ par feature et prdit avec un modle entran"""
+    features = training_frame.drop(columns=["target"])
+    preprocessor = DataTransformation().get_data_transformer_object()
+    model = LinearRegression().fit(preprocessor.fit_transform(features), training_frame["target"])
+
+    pipeline = PredictPipeline()
+    pipeline.preprocessor_path = str(tmp_path / "preprocessor.pkl")
+    pipeline.model_path = str(tmp_path / "model.pkl")
+    save_object(pipeline.preprocessor_path, preprocessor)
+    save_object(pipeline.model_path, model)
+    monkeypatch.setattr(app, "_PIPELINE", pipeline)
+
+    client = app.app.test_client()
+    form = client.get("/predict_form").get_data(as_text=True)
+    assert all(f'name="{column}"' in form for column in app.FEATURE_COLUMNS)
+
+    row = _valid_row(training_frame)
+    response = client.post("/predict_form", data={key: str(value) for key, value in row.items()})
+
+    expected = model.predict(preprocessor.transform(features.iloc[[0]]))[0]
+    assert f"{expected:.4f}" in response.get_data(as_text=True)
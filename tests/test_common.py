@@ -0,0 +1,49 @@
+"""
+Tests des fonctions utilitaires (src/utils/common.py)
+"""
+
+import logging
+
+import numpy as np
+from sklearn.tree import DecisionTreeRegressor
+
+from src.utils.common import _fit_one, evaluate_models
+
+
+def _regression_data():
+    """Petit jeu de rgression (train, test)"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(120, 3)).astype(np.float32)
+    y = (X @ np.array([1.0, 2.0, 3.0])).astype(np.float32)
+    return X[:90], y[:90], X[90:], y[90:]
+
+
+def test_fit_one_returns_details_without_logging(caplog):
+    """Le worker ne journalise rien : paramtres et score train sont retourns"""
+    X_train, y_train, X_test, y_test = _regression_data()
+    params = {"max_depth": [2, 4]}
+
+    with caplog.at_level(logging.DEBUG):
+        name, test_score, model, best_params, train_score = _fit_one(
+            "Decision Tree", DecisionTreeRegressor(), params,
+            X_train, y_train, X_test, y_test, n_jobs=1, train_score=True
+        )
+
+    assert not caplog.records
+    assert name == "Decision Tree"
+    assert best_params["max_depth"] in params["max_depth"]
+    assert train_score is not None and np.isfinite(test_score)
+
+
+def test_evaluate_models_logs_model_details_in_parent(caplog):
+    """Le processus principal journalise le score de chaque modle"""
+    X_train, y_train, X_test, y_test = _regression_data()
+
+    with caplog.at_level(logging.INFO):
+        report, _ = evaluate_models(
+            X_train, y_train, X_test, y_test,
+            models={"Decision Tree": DecisionTreeRegressor()},
+            param={"Decision Tree": {"max_depth": [2, 4]}}
+        )
+
+    assert f"Score R2 test (Decision Tree) : {report['Decision Tree']:.4f}" in caplog.text
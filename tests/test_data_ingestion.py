@@ -0,0 +1,31 @@
+"""
+Tests de l'ingestion de donnes (src/components/data_ingestion.py)
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.components.data_ingestion import DataIngestion
+
+
+def test_split_is_shuffled_with_exact_test_size(tmp_path, monkeypatch):
+    """Les ensembles train/test sont mlangs et le test fait exactement test_size"""
+    monkeypatch.chdir(tmp_path)
+    source_path = tmp_path / "data.csv"
+    pd.DataFrame({"feature1": np.arange(100, dtype=float), "target": np.arange(100)}).to_csv(
+        source_path, index=False
+    )
+
+    ingestion = DataIngestion()
+    ingestion.ingestion_config.source_data_path = str(source_path)
+    ingestion.ingestion_config.raw_data_path = str(source_path)
+    train_path, test_path = ingestion.initiate_data_ingestion()
+
+    train_set = pd.read_parquet(train_path)
+    test_set = pd.read_parquet(test_path)
+
+    assert len(test_set) == 20
+    assert len(train_set) == 80
+    assert sorted(train_set["target"].tolist() + test_set["target"].tolist()) == list(range(100))
+    # L'ordre du fichier source n'est pas conserv
+    assert not train_set["target"].is_monotonic_increasing
@@ -0,0 +1,41 @@
+"""
+Tests de la configuration des logs (src/logger.py)
+"""
+
+import os
+import logging
+
+import pytest
+
+from src import logger
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork indisponible")
+def test_forked_process_writes_to_its_own_file(tmp_path, monkeypatch):
+    """Aprs un fork, l'enfant crit dans un fichier  son PID, pas dans celui du parent"""
+    monkeypatch.setattr(logger, "LOGS_DIR", str(tmp_path))
+    handler = logger.LazyFileHandler()
+    test_logger = logging.getLogger("test_forked_process_writes_to_its_own_file")
+    test_logger.propagate = False
+    test_logger.addHandler(handler)
+
+    try:
+        assert not os.listdir(tmp_path)  # Rien n'est cr avant le premier message
+
+        test_logger.warning("parent")
+        pid = os.fork()
+        if pid == 0:
+            test_logger.warning("enfant")
+            handler.flush()
+            os._exit(0)
+        os.waitpid(pid, 0)
+    finally:
+        test_logger.removeHandler(handler)
+        handler.close()
+
+    parent_file = tmp_path / os.path.basename(logger._log_file_path())
+    child_files = [name for name in os.listdir(tmp_path) if name.endswith(f"_pid{pid}.log")]
+
+    assert "enfant" not in parent_file.read_text()
+    assert len(child_files) == 1
+    assert "enfant" in (tmp_path / child_files[0]).read_text()
@@ -0,0 +1,48 @@
+"""
+Tests de l'entranement des modles (src/components/model_trainer.py)
+"""
+
+import os
+
+import numpy as np
+
+from src.components.data_transformation import DataTransformation, _concat_features_target
+from src.components.model_trainer import ModelTrainer, _compact_features, _feature_layout
+from src.utils.common import split_features_target
+
+
+def test_trains_on_default_preprocessor_output(training_frame, tmp_path, monkeypatch):
+    """Tous les modles s'entranent sur la sortie du preprocessor par dfaut"""
+    monkeypatch.chdir(tmp_path)
+    features = training_frame.drop(columns=["target"])
+    target = training_frame["target"]
+
+    preprocessor = DataTransformation().get_data_transformer_object()
+    train_arr = _concat_features_target(preprocessor.fit_transform(features[:300]), target[:300])
+    test_arr = _concat_features_target(preprocessor.transform(features[300:]), target[300:])
+
+    trainer = ModelTrainer()
+    score = trainer.initiate_model_trainer(train_arr, test_arr, preprocessor=preprocessor)
+
+    assert score >= 0.6
+    assert os.path.exists(trainer.model_trainer_config.trained_model_file_path)
+
+    # Le modle retenu prdit directement sur la sortie du preprocessor
+    X_test, _ = split_features_target(test_arr)
+    assert trainer.best_model.predict(X_test).shape == (100,)
+
+
+def test_compact_features_encodes_one_hot_blocks_as_codes(training_frame):
+    """Les blocs one-hot deviennent des codes ordinaux (NaN si catgorie inconnue)"""
+    features = training_frame.drop(columns=["target"])
+    preprocessor = DataTransformation().get_data_transformer_object().fit(features)
+    numeric_indices, one_hot_groups = _feature_layout(preprocessor)
+
+    unseen = features.iloc[:2].copy()
+    unseen.loc[unseen.index[1], "category1"] = "inconnue"
+    compact = _compact_features(preprocessor.transform(unseen), numeric_indices, one_hot_groups)
+
+    assert compact.shape == (2, len(numeric_indices) + len(one_hot_groups))
+    categories = preprocessor.named_transformers_["cat_pipeline"].named_steps["one_hot_encoder"].categories_
+    assert categories[0][int(compact[0, len(numeric_indices)])] == unseen["category1"].iloc[0]
+    assert np.isnan(compact[1, len(numeric_indices)])
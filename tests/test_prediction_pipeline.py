@@ -0,0 +1,71 @@
+"""
+Tests du regroupement des prdictions (src/pipeline/prediction_pipeline.py)
+"""
+
+import os
+import threading
+
+import pytest
+
+from src.pipeline.prediction_pipeline import PredictionBatcher
+
+
+class _RecordingPredict:
+    """Fonction de prdiction factice : double x et mmorise la taille des lots"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, rows):
+        self.batch_sizes.append(len(rows))
+        return [2 * row["x"] for row in rows]
+
+
+def test_submits_are_coalesced_up_to_max_batch_size():
+    """20 soumissions avec des lots de 8 donnent les lots [8, 8, 4]"""
+    predict_fn = _RecordingPredict()
+    batcher = PredictionBatcher(predict_fn, max_batch_size=8, max_wait_ms=200)
+
+    futures = [batcher.submit({"x": i}) for i in range(20)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert predict_fn.batch_sizes == [8, 8, 4]
+
+
+def test_results_are_routed_to_their_own_future():
+    """Chaque Future reoit la prdiction de sa propre observation"""
+    batcher = PredictionBatcher(_RecordingPredict(), max_batch_size=16, max_wait_ms=50)
+
+    futures = [batcher.submit({"x": i}) for i in range(10)]
+
+    assert [future.result(timeout=5) for future in futures] == [2 * i for i in range(10)]
+
+
+def test_batch_failure_reaches_every_future():
+    """Une exception de la prdiction est transmise  toutes les requtes du lot"""
+    def failing_predict(rows):
+        raise ValueError("lot invalide")
+
+    batcher = PredictionBatcher(failing_predict, max_batch_size=4, max_wait_ms=200)
+
+    futures = [batcher.submit({"x": i}) for i in range(4)]
+
+    for future in futures:
+        with pytest.raises(ValueError, match="lot invalide"):
+            future.result(timeout=5)
+
+
+def test_worker_restarts_when_pid_changes(monkeypatch):
+    """Un nouveau PID (processus fork) dmarre un nouveau thread et une nouvelle file"""
+    batcher = PredictionBatcher(_RecordingPredict(), max_batch_size=4, max_wait_ms=1)
+    assert batcher.submit({"x": 1}).result(timeout=5) == 2
+    first_queue = batcher._queue
+    workers_before = sum(t.name == "prediction-batcher" for t in threading.enumerate())
+
+    monkeypatch.setattr(os, "getpid", lambda: -1)
+    assert batcher.submit({"x": 3}).result(timeout=5) == 6
+
+    assert batcher._worker_pid == -1
+    assert batcher._queue is not first_queue
+    assert sum(t.name == "prediction-batcher" for t in threading.enumerate()) == workers_before + 1